@@ -10,7 +10,6 @@ import type {
   GeminiOptions,
   JsonStreamEvent,
   QueryResult,
-  ToolResultEvent,
 } from './types';
 import { JsonStreamEventType, ProcessStatus } from './types';
 
@@ -61,48 +60,53 @@ export class GeminiClient extends EventEmitter {
 
     try {
       for await (const event of query(prompt, this.options)) {
-        // Track session ID
-        if (event.type === JsonStreamEventType.INIT) {
-          this.currentSessionId = event.session_id;
-          this.emit('session', event.session_id);
-        }
-
-        // Handle permission request for tool execution
-        if (event.type === JsonStreamEventType.TOOL_USE && this.options.onPermissionRequest) {
-          const permissionRequest = {
-            toolId: event.tool_id,
-            toolName: event.tool_name,
-            parameters: event.parameters,
-            timestamp: event.timestamp,
-          };
-
-          try {
-            const decision = await this.options.onPermissionRequest(permissionRequest);
-
-            // Emit permission decision event
-            this.emit('permission', {
-              request: permissionRequest,
-              decision,
-            });
-
-            // Note: Since Gemini CLI has already executed the tool (approvalMode handling),
-            // we can only log the decision here. To actually prevent execution,
-            // use approvalMode='default' and handle stdin/stdout interaction.
-            if (!decision.approved) {
-              this.emit('warning', {
-                type: JsonStreamEventType.ERROR,
-                severity: 'warning',
-                message: `Tool ${event.tool_name} was denied by permission callback but may have already executed`,
-                timestamp: new Date().toISOString(),
-              });
+        // Dispatch on the event type once per event
+        switch (event.type) {
+          // Track session ID
+          case JsonStreamEventType.INIT:
+            this.currentSessionId = event.session_id;
+            this.emit('session', event.session_id);
+            break;
+
+          // Handle permission request for tool execution
+          case JsonStreamEventType.TOOL_USE:
+            if (this.options.onPermissionRequest) {
+              const permissionRequest = {
+                toolId: event.tool_id,
+                toolName: event.tool_name,
+                parameters: event.parameters,
+                timestamp: event.timestamp,
+              };
+
+              try {
+                const decision = await this.options.onPermissionRequest(permissionRequest);
+
+                // Emit permission decision event
+                this.emit('permission', {
+                  request: permissionRequest,
+                  decision,
+                });
+
+                // Note: Since Gemini CLI has already executed the tool (approvalMode handling),
+                // we can only log the decision here. To actually prevent execution,
+                // use approvalMode='default' and handle stdin/stdout interaction.
+                if (!decision.approved) {
+                  this.emit('warning', {
+                    type: JsonStreamEventType.ERROR,
+                    severity: 'warning',
+                    message: `Tool ${event.tool_name} was denied by permission callback but may have already executed`,
+                    timestamp: new Date().toISOString(),
+                  });
+                }
+              } catch (error) {
+                this.emit('error', {
+                  message: `Permission callback error for tool ${event.tool_name}`,
+                  error,
+                });
+                // Continue processing even if permission callback fails
+              }
             }
-          } catch (error) {
-            this.emit('error', {
-              message: `Permission callback error for tool ${event.tool_name}`,
-              error,
-            });
-            // Continue processing even if permission callback fails
-          }
+            break;
         }
 
         // Emit event
@@ -141,13 +145,13 @@ export class GeminiClient extends EventEmitter {
       status: 'success',
     };
 
+    // Pending tool calls awaiting their result; entries are dropped once resolved
     const toolCallsMap = new Map<
       string,
       {
         tool_name: string;
         tool_id: string;
         parameters: Record<string, unknown>;
-        result?: ToolResultEvent;
       }
     >();
 
@@ -176,7 +180,7 @@ export class GeminiClient extends EventEmitter {
           {
             const toolCall = toolCallsMap.get(event.tool_id);
             if (toolCall) {
-              toolCall.result = event;
+              toolCallsMap.delete(event.tool_id);
               result.toolCalls.push({
                 tool_name: toolCall.tool_name,
                 tool_id: toolCall.tool_id,
@@ -0,0 +1,200 @@
+/**
+ * JSONL (JSON Lines) helpers for reading Gemini CLI stdout
+ */
+
+const NEWLINE = 0x0a;
+const CARRIAGE_RETURN = 0x0d;
+const QUOTE = 0x22;
+const BACKSLASH = 0x5c;
+const OPEN_BRACE = 0x7b;
+const CLOSE_BRACE = 0x7d;
+
+/**
+ * Splits raw stdout chunks into complete lines
+ *
+ * Works directly on Buffers: bytes are only decoded once a full line is
+ * available, so there is no per-chunk string decoding layer and a multi-byte
+ * UTF-8 character split across two chunks is never decoded in halves.
+ *
+ * @example
+ * ```typescript
+ * const splitter = new JsonlLineSplitter();
+ * stdout.on('data', (chunk: Buffer) => {
+ *   for (const line of splitter.push(chunk)) {
+ *     handleLine(line);
+ *   }
+ * });
+ * ```
+ */
+export class JsonlLineSplitter {
+  private pending: Buffer[] = [];
+
+  /**
+   * Feed a chunk of stdout
+   *
+   * @param chunk - Raw bytes read from the stream
+   * @returns string[] - Complete lines finished by this chunk (without line terminators)
+   */
+  push(chunk: Buffer): string[] {
+    const lines: string[] = [];
+    let start = 0;
+    let newline = chunk.indexOf(NEWLINE);
+
+    if (newline === -1) {
+      if (chunk.length > 0) {
+        this.pending.push(chunk);
+      }
+      return lines;
+    }
+
+    // Complete the partial line carried over from previous chunks
+    if (this.pending.length > 0) {
+      this.pending.push(chunk.subarray(0, newline));
+      const head = Buffer.concat(this.pending);
+      this.pending = [];
+      lines.push(decodeLine(head, 0, head.length));
+      start = newline + 1;
+      newline = chunk.indexOf(NEWLINE, start);
+    }
+
+    while (newline !== -1) {
+      lines.push(decodeLine(chunk, start, newline));
+      start = newline + 1;
+      newline = chunk.indexOf(NEWLINE, start);
+    }
+
+    if (start < chunk.length) {
+      this.pending.push(chunk.subarray(start));
+    }
+
+    return lines;
+  }
+
+  /**
+   * Return the trailing line that was not terminated by a newline and reset the splitter
+   *
+   * @returns string | null - Trailing line, or null if nothing is pending
+   */
+  flush(): string | null {
+    if (this.pending.length === 0) {
+      return null;
+    }
+
+    const rest = Buffer.concat(this.pending);
+    this.pending = [];
+    return decodeLine(rest, 0, rest.length);
+  }
+}
+
+/**
+ * Decode bytes [start, end) as UTF-8, dropping a trailing carriage return
+ */
+function decodeLine(buffer: Buffer, start: number, end: number): string {
+  if (end > start && buffer[end - 1] === CARRIAGE_RETURN) {
+    end--;
+  }
+  return buffer.toString('utf8', start, end);
+}
+
+/**
+ * Return a stdout line ready for parsing if it is an event line, or null otherwise
+ *
+ * Events are always JSON objects, so blank lines and CLI debug output
+ * (e.g. `[MESSAGE_BUS] ...`) are recognised by their first character without
+ * paying for a thrown SyntaxError. Only lines that do not start with `{` are
+ * trimmed, so a line padded with whitespace or a BOM is still accepted.
+ *
+ * @param line - Line without its line terminator
+ * @returns string | null - Line to pass to parseJsonLine, or null to skip it
+ */
+export function normalizeEventLine(line: string): string | null {
+  if (line.charCodeAt(0) === OPEN_BRACE) {
+    return line;
+  }
+
+  // Rare: padded line, fall back to trimming
+  const trimmed = line.trim();
+  return trimmed.charCodeAt(0) === OPEN_BRACE ? trimmed : null;
+}
+
+/**
+ * Parse a JSONL line
+ *
+ * A line normally holds a single JSON value. Some stream flushers coalesce
+ * several objects onto one line (e.g. `{"a":1}{"b":2}`); instead of dropping
+ * the whole line, every object on it is returned in order.
+ *
+ * @param line - Line without its line terminator
+ * @returns unknown[] - Parsed values
+ * @throws SyntaxError if the line is neither a JSON value nor a sequence of JSON objects
+ */
+export function parseJsonLine(line: string): unknown[] {
+  try {
+    return [JSON.parse(line)];
+  } catch (error) {
+    const segments = splitConcatenatedObjects(line);
+    if (!segments || segments.length < 2) {
+      throw error;
+    }
+    return segments.map((segment): unknown => JSON.parse(segment));
+  }
+}
+
+/**
+ * Split a line into its top-level `{...}` segments
+ *
+ * @returns string[] | null - Segments, or null if anything other than
+ * whitespace appears between objects or braces are unbalanced
+ */
+function splitConcatenatedObjects(line: string): string[] | null {
+  const segments: string[] = [];
+  let depth = 0;
+  let start = 0;
+  let inString = false;
+  let escaped = false;
+
+  for (let i = 0; i < line.length; i++) {
+    const ch = line.charCodeAt(i);
+
+    if (inString) {
+      if (escaped) {
+        escaped = false;
+      } else if (ch === BACKSLASH) {
+        escaped = true;
+      } else if (ch === QUOTE) {
+        inString = false;
+      }
+      continue;
+    }
+
+    if (ch === OPEN_BRACE) {
+      if (depth === 0) {
+        start = i;
+      }
+      depth++;
+    } else if (ch === CLOSE_BRACE) {
+      if (depth === 0) {
+        return null;
+      }
+      depth--;
+      if (depth === 0) {
+        segments.push(line.slice(start, i + 1));
+      }
+    } else if (depth === 0) {
+      if (!isWhitespace(ch)) {
+        return null;
+      }
+    } else if (ch === QUOTE) {
+      inString = true;
+    }
+  }
+
+  return depth === 0 ? segments : null;
+}
+
+/**
+ * JSON insignificant whitespace
+ */
+function isWhitespace(ch: number): boolean {
+  return ch === 0x20 || ch === 0x09 || ch === 0x0a || ch === 0x0d;
+}
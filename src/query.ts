@@ -5,15 +5,15 @@
  */
 
 import { spawn, type ChildProcess } from 'child_process';
-import * as readline from 'readline';
 import type { GeminiOptions, JsonStreamEvent } from './types';
 import { GeminiSDKError, ExitCode } from './types';
+import { JsonlLineSplitter, normalizeEventLine, parseJsonLine } from './jsonl';
 
 /**
- * Build CLI arguments from options
+ * Build the full argv for the node process (CLI script path first) from options
  */
 function buildCliArgs(options: GeminiOptions, prompt: string): string[] {
-  const args: string[] = [];
+  const args: string[] = [options.pathToGeminiCLI];
 
   // Output format: always use stream-json
   args.push('--output-format', 'stream-json');
@@ -120,6 +120,33 @@ function buildEnv(options: GeminiOptions): NodeJS.ProcessEnv {
   return env;
 }
 
+/**
+ * Parse a single stdout line into events
+ *
+ * @returns JsonStreamEvent[] - Usually one event; empty for blank, debug or malformed lines
+ */
+function parseEventLine(line: string, options: GeminiOptions): JsonStreamEvent[] {
+  // Skip blank and debug lines up front
+  const eventLine = normalizeEventLine(line);
+  if (eventLine === null) {
+    if (line && options.debug) {
+      console.error('[Gemini SDK] Skipping non-JSON line:', line.substring(0, 100));
+    }
+    return [];
+  }
+
+  try {
+    return parseJsonLine(eventLine) as JsonStreamEvent[];
+  } catch (parseError) {
+    // Log parse errors but continue processing
+    if (options.debug) {
+      console.error('[Gemini SDK] Failed to parse JSON line:', line);
+      console.error('[Gemini SDK] Parse error:', parseError);
+    }
+    return [];
+  }
+}
+
 /**
  * Query Gemini CLI and stream JSON events
  *
@@ -170,7 +197,7 @@ export async function* query(
   // Spawn Gemini CLI subprocess
   let geminiProcess: ChildProcess;
   try {
-    geminiProcess = spawn(nodeExecutable, [options.pathToGeminiCLI, ...args], {
+    geminiProcess = spawn(nodeExecutable, args, {
       stdio: ['pipe', 'pipe', 'pipe'],
       env,
       cwd,
@@ -179,6 +206,29 @@ export async function* query(
     throw new GeminiSDKError('Failed to spawn Gemini CLI process', undefined, error);
   }
 
+  // Track process exit while stdout is still being read, so an early 'exit'
+  // (e.g. on timeout) is never missed by a listener attached too late
+  const exited = new Promise<number>((resolve, reject) => {
+    geminiProcess.on('exit', (code, signal) => {
+      if (signal) {
+        reject(
+          new GeminiSDKError(
+            `Gemini CLI process was killed with signal ${signal}`,
+            ExitCode.USER_INTERRUPTED,
+          ),
+        );
+      } else {
+        resolve(code ?? ExitCode.GENERAL_ERROR);
+      }
+    });
+
+    geminiProcess.on('error', (error) => {
+      reject(new GeminiSDKError('Gemini CLI process error', undefined, error));
+    });
+  });
+  // Rejections are surfaced when awaited below; don't report them as unhandled meanwhile
+  exited.catch(() => undefined);
+
   // Handle stderr (CLI internal logs)
   const stderrChunks: Buffer[] = [];
   geminiProcess.stderr?.on('data', (data: Buffer) => {
@@ -196,28 +246,34 @@ export async function* query(
     }, options.timeout);
   }
 
-  // Create readline interface for stdout
-  const rl = readline.createInterface({
-    input: geminiProcess.stdout!,
-    crlfDelay: Infinity,
-  });
+  // Split stdout into JSON lines chunk by chunk: every complete line that
+  // arrived in a read is parsed in one pass
+  const splitter = new JsonlLineSplitter();
 
   // Track if we've yielded any events
   let hasYieldedEvents = false;
 
+  // Resolve the per-chunk callee once instead of on every chunk
+  const push = splitter.push.bind(splitter);
+  const stdout = geminiProcess.stdout! as AsyncIterable<Buffer>;
+
   try {
     // Stream JSON-Lines output
-    for await (const line of rl) {
-      try {
-        const event = JSON.parse(line) as JsonStreamEvent;
+    for await (const chunk of stdout) {
+      for (const line of push(chunk)) {
+        for (const event of parseEventLine(line, options)) {
+          hasYieldedEvents = true;
+          yield event;
+        }
+      }
+    }
+
+    // Final line without trailing newline
+    const rest = splitter.flush();
+    if (rest !== null) {
+      for (const event of parseEventLine(rest, options)) {
         hasYieldedEvents = true;
         yield event;
-      } catch (parseError) {
-        // Log parse errors but continue processing
-        if (options.debug) {
-          console.error('[Gemini SDK] Failed to parse JSON line:', line);
-          console.error('[Gemini SDK] Parse error:', parseError);
-        }
       }
     }
   } catch (error) {
@@ -230,24 +286,7 @@ export async function* query(
   }
 
   // Wait for process to exit
-  const exitCode = await new Promise<number>((resolve, reject) => {
-    geminiProcess.on('exit', (code, signal) => {
-      if (signal) {
-        reject(
-          new GeminiSDKError(
-            `Gemini CLI process was killed with signal ${signal}`,
-            ExitCode.USER_INTERRUPTED,
-          ),
-        );
-      } else {
-        resolve(code ?? ExitCode.GENERAL_ERROR);
-      }
-    });
-
-    geminiProcess.on('error', (error) => {
-      reject(new GeminiSDKError('Gemini CLI process error', undefined, error));
-    });
-  });
+  const exitCode = await exited;
 
   // Handle exit code
   if (exitCode !== ExitCode.SUCCESS) {
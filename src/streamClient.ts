@@ -10,10 +10,9 @@
 
 import { EventEmitter } from 'node:events';
 import { spawn, type ChildProcess } from 'node:child_process';
-import * as readline from 'node:readline';
 import * as fs from 'node:fs';
 import * as path from 'node:path';
-import type { Writable } from 'node:stream';
+import type { Readable, Writable } from 'node:stream';
 import {
   GeminiStreamOptions,
   JsonStreamEvent,
@@ -24,6 +23,33 @@ import {
   GeminiSDKError,
   ProcessStatus,
 } from './types.js';
+import { JsonlLineSplitter, normalizeEventLine, parseJsonLine } from './jsonl.js';
+
+/**
+ * Maximum number of stderr bytes retained for error reporting.
+ * Older output is discarded so a chatty CLI cannot grow memory without bound.
+ */
+const MAX_STDERR_BYTES = 64 * 1024;
+
+/**
+ * Run the CLI in its own process group on POSIX so stop() can signal it together
+ * with any tools or MCP servers it spawned. The group no longer receives a
+ * terminal Ctrl-C, so it is also signalled when the host process exits.
+ * (On Windows `detached` would open a new console instead.)
+ */
+const USE_PROCESS_GROUP = process.platform !== 'win32';
+
+/**
+ * How long stop() waits, after the CLI has exited, for stdout to end so trailing
+ * events are delivered. Bounded separately from the exit timeout because the
+ * child's 'close' can be held off indefinitely by grandchildren inheriting stderr.
+ */
+const STDOUT_DRAIN_TIMEOUT_MS = 500;
+
+/**
+ * How long processes left in the CLI's group get to exit after SIGTERM before SIGKILL
+ */
+const GROUP_REAP_TIMEOUT_MS = 1000;
 
 /**
  * Events emitted by GeminiStreamClient
@@ -74,12 +100,25 @@ export declare interface GeminiStreamClient {
  */
 export class GeminiStreamClient extends EventEmitter {
   private process: ChildProcess | null = null;
+  private processGroupId: number | null = null;
+  private processGroupReaped: Promise<void> = Promise.resolve();
+  private readonly terminateProcessGroupOnExit = (): void => {
+    if (this.processGroupId !== null) {
+      try {
+        process.kill(-this.processGroupId, 'SIGTERM');
+      } catch {
+        // Group already gone
+      }
+    }
+  };
   private stdinStream: Writable | null = null;
-  private readlineInterface: readline.Interface | null = null;
+  private stdoutStream: Readable | null = null;
   private status: ProcessStatus = ProcessStatus.IDLE;
   private initEvent: InitEvent | null = null;
   private initTimeout: NodeJS.Timeout | null = null;
   private tempSettingsPath: string | null = null;
+  private stderrChunks: Buffer[] = [];
+  private stderrBytes = 0;
 
   constructor(private options: GeminiStreamOptions) {
     super();
@@ -102,6 +141,8 @@ export class GeminiStreamClient extends EventEmitter {
     }
 
     this.status = ProcessStatus.RUNNING;
+    this.stderrChunks = [];
+    this.stderrBytes = 0;
 
     // Create temporary settings.json if hooks or mcpServers are configured
     if (this.options.hooks || this.options.mcpServers) {
@@ -122,8 +163,16 @@ export class GeminiStreamClient extends EventEmitter {
       stdio: ['pipe', 'pipe', 'pipe'],
       cwd: this.options.cwd || process.cwd(),
       env,
+      detached: USE_PROCESS_GROUP,
     });
 
+    // Remember the group id: tools and MCP servers spawned by the CLI may outlive it
+    this.processGroupId = USE_PROCESS_GROUP && this.process.pid !== undefined ? this.process.pid : null;
+    if (this.processGroupId !== null) {
+      // The group is outside the host's job control; don't leave it behind when the host exits
+      process.once('exit', this.terminateProcessGroupOnExit);
+    }
+
     // Handle process events
     this.process.on('exit', (code, signal) => {
       this.handleProcessExit(code, signal);
@@ -144,12 +193,9 @@ export class GeminiStreamClient extends EventEmitter {
       throw new GeminiSDKError('Failed to get stdin stream');
     }
 
-    // Setup stdout readline interface
+    // Setup stdout JSONL reader (raw Buffer chunks, no readline/text decoding layer)
     if (this.process.stdout) {
-      this.readlineInterface = readline.createInterface({
-        input: this.process.stdout,
-        terminal: false, // CRITICAL: Non-terminal mode for JSONL
-      });
+      this.stdoutStream = this.process.stdout;
 
       // Start reading events
       this.startReadLoop();
@@ -157,9 +203,10 @@ export class GeminiStreamClient extends EventEmitter {
       throw new GeminiSDKError('Failed to get stdout stream');
     }
 
-    // Handle stderr (always process to prevent mixing with stdout)
+    // Handle stderr (always consume so the CLI never blocks on a full pipe)
     if (this.process.stderr) {
-      this.process.stderr.on('data', (chunk) => {
+      this.process.stderr.on('data', (chunk: Buffer) => {
+        this.appendStderr(chunk);
         // Only log in debug mode, but always consume stderr
         if (this.options.debug) {
           console.error('[GeminiStreamClient] stderr:', chunk.toString());
@@ -248,7 +295,10 @@ export class GeminiStreamClient extends EventEmitter {
    * Stop the CLI process
    */
   async stop(timeout: number = 5000): Promise<void> {
-    if (!this.process) {
+    const child = this.process;
+    if (!child) {
+      // CLI already exited; let the reaping of its process group finish
+      await this.processGroupReaped;
       return;
     }
 
@@ -264,39 +314,39 @@ export class GeminiStreamClient extends EventEmitter {
       this.stdinStream = null;
     }
 
-    // Close readline interface
-    if (this.readlineInterface) {
-      this.readlineInterface.close();
-      this.readlineInterface = null;
+    // Wait for process to exit (with timeout), then briefly for stdout to end; stdout
+    // stays attached so events the CLI flushes on shutdown are still delivered
+    await this.waitForExit(child, timeout);
+    if (!this.isProcessRunning(child)) {
+      await this.waitForStdoutEnd(child, STDOUT_DRAIN_TIMEOUT_MS);
     }
 
-    // Wait for process to exit (with timeout)
-    await Promise.race([
-      new Promise<void>((resolve) => {
-        if (this.process) {
-          this.process.once('exit', () => resolve());
-        } else {
-          resolve();
-        }
-      }),
-      new Promise<void>((resolve) => setTimeout(resolve, timeout)),
-    ]);
-
     // Force kill if still running
-    if (this.process && !this.process.killed) {
-      this.process.kill('SIGTERM');
+    // (note: ChildProcess.killed only means a signal was sent, not that the process exited)
+    if (this.isProcessRunning(child)) {
+      this.killProcess(child, 'SIGTERM');
 
       // Wait a bit more
-      await new Promise((resolve) => setTimeout(resolve, 1000));
+      await this.waitForExit(child, 1000);
 
       // SIGKILL if still not dead
-      if (this.process && !this.process.killed) {
-        this.process.kill('SIGKILL');
+      if (this.isProcessRunning(child)) {
+        this.killProcess(child, 'SIGKILL');
+        await this.waitForExit(child, 1000);
       }
     }
 
+    // Tools or MCP servers the CLI left in its process group are reaped once it exits
+    await this.processGroupReaped;
+
+    // Stop reading stdout
+    this.stopReadLoop();
+
     this.process = null;
-    this.status = ProcessStatus.COMPLETED;
+    // handleProcessExit() already recorded how the CLI ended; don't mask an ERROR
+    if (this.status === ProcessStatus.RUNNING) {
+      this.status = ProcessStatus.COMPLETED;
+    }
 
     // Clean up temporary settings file
     if (this.tempSettingsPath) {
@@ -340,6 +390,157 @@ export class GeminiStreamClient extends EventEmitter {
     return this.process?.pid;
   }
 
+  /**
+   * Get the most recent stderr output of the CLI process (bounded tail)
+   */
+  getStderr(): string {
+    return Buffer.concat(this.stderrChunks).toString();
+  }
+
+  /**
+   * Append a stderr chunk, dropping the oldest chunks beyond MAX_STDERR_BYTES
+   */
+  private appendStderr(chunk: Buffer): void {
+    this.stderrChunks.push(chunk);
+    this.stderrBytes += chunk.length;
+
+    while (this.stderrBytes > MAX_STDERR_BYTES && this.stderrChunks.length > 1) {
+      this.stderrBytes -= this.stderrChunks.shift()!.length;
+    }
+  }
+
+  /**
+   * Whether the CLI process has been spawned and not yet exited
+   */
+  private isProcessRunning(child: ChildProcess): boolean {
+    return child.exitCode === null && child.signalCode === null;
+  }
+
+  /**
+   * Whether any process is left in the CLI's process group (POSIX only)
+   *
+   * The group id is forgotten as soon as a probe fails, so it is never signalled
+   * after the kernel could have handed the pid to an unrelated group.
+   */
+  private isProcessGroupAlive(): boolean {
+    if (this.processGroupId === null) {
+      return false;
+    }
+
+    try {
+      process.kill(-this.processGroupId, 0);
+      return true;
+    } catch {
+      this.forgetProcessGroup();
+      return false;
+    }
+  }
+
+  /**
+   * Signal the running CLI process, including its whole process group on POSIX
+   */
+  private killProcess(child: ChildProcess, signal: NodeJS.Signals): void {
+    if (this.processGroupId !== null) {
+      try {
+        process.kill(-this.processGroupId, signal);
+        return;
+      } catch {
+        // Group already gone; fall back to signalling the child directly
+      }
+    }
+
+    child.kill(signal);
+  }
+
+  /**
+   * Terminate whatever the exited CLI left in its process group, then forget the group id
+   */
+  private async reapProcessGroup(): Promise<void> {
+    if (!this.isProcessGroupAlive()) {
+      return;
+    }
+
+    const pgid = this.processGroupId!;
+    if (this.options.debug) {
+      console.log('[GeminiStreamClient] Terminating leftover processes in group:', pgid);
+    }
+
+    try {
+      process.kill(-pgid, 'SIGTERM');
+    } catch {
+      // Group emptied in the meantime
+    }
+
+    const deadline = Date.now() + GROUP_REAP_TIMEOUT_MS;
+    while (this.isProcessGroupAlive() && Date.now() < deadline) {
+      await new Promise((resolve) => setTimeout(resolve, 50));
+    }
+
+    if (this.isProcessGroupAlive()) {
+      try {
+        process.kill(-pgid, 'SIGKILL');
+      } catch {
+        // Group emptied in the meantime
+      }
+    }
+
+    this.forgetProcessGroup();
+  }
+
+  /**
+   * Drop the process group id and its host-exit hook
+   */
+  private forgetProcessGroup(): void {
+    this.processGroupId = null;
+    process.off('exit', this.terminateProcessGroupOnExit);
+  }
+
+  /**
+   * Wait until the process has exited, or the timeout elapses
+   */
+  private async waitForExit(child: ChildProcess, timeout: number): Promise<void> {
+    if (child.exitCode !== null || child.signalCode !== null) {
+      return;
+    }
+
+    await this.waitForEvent(child, 'exit', timeout);
+  }
+
+  /**
+   * Wait until the process's stdout has ended, or the timeout elapses
+   */
+  private async waitForStdoutEnd(child: ChildProcess, timeout: number): Promise<void> {
+    const stdout = child.stdout;
+    if (!stdout || stdout.readableEnded || stdout.destroyed) {
+      return;
+    }
+
+    await this.waitForEvent(stdout, 'end', timeout);
+  }
+
+  /**
+   * Wait for a single emitter event, or the timeout elapses
+   */
+  private async waitForEvent(emitter: EventEmitter, event: string, timeout: number): Promise<void> {
+    let timer: NodeJS.Timeout | undefined;
+    let onEvent: (() => void) | undefined;
+
+    await Promise.race([
+      new Promise<void>((resolve) => {
+        onEvent = resolve;
+        emitter.once(event, onEvent);
+      }),
+      new Promise<void>((resolve) => {
+        timer = setTimeout(resolve, timeout);
+      }),
+    ]);
+
+    clearTimeout(timer);
+    if (onEvent) {
+      emitter.off(event, onEvent);
+    }
+  }
+
   /**
    * Create settings.json in GEMINI_CONFIG_DIR for hooks and MCP servers configuration
    *
@@ -492,7 +693,15 @@ export class GeminiStreamClient extends EventEmitter {
       console.log('[GeminiStreamClient] Writing message to stdin:', json.substring(0, 100));
     }
 
-    const success = this.stdinStream.write(json + '\n', (error) => {
+    // Coalesce messages written in the same tick (e.g. interrupt followed by a
+    // new message) into a single pipe write
+    const stdin = this.stdinStream;
+    if (!stdin.writableCorked) {
+      stdin.cork();
+      process.nextTick(() => stdin.uncork());
+    }
+
+    const success = stdin.write(json + '\n', (error) => {
       if (error) {
         console.error('[GeminiStreamClient] Write error:', error);
       } else if (this.options.debug) {
@@ -501,7 +710,7 @@ export class GeminiStreamClient extends EventEmitter {
     });
 
     if (this.options.debug) {
-      console.log('[GeminiStreamClient] Write success:', success, 'Stream writable:', this.stdinStream.writable);
+      console.log('[GeminiStreamClient] Write success:', success, 'Stream writable:', stdin.writable);
     }
   }
 
@@ -509,41 +718,72 @@ export class GeminiStreamClient extends EventEmitter {
    * Start reading JSONL events from stdout
    */
   private startReadLoop(): void {
-    if (!this.readlineInterface) {
+    const stdout = this.stdoutStream;
+    if (!stdout) {
       return;
     }
 
-    this.readlineInterface.on('line', (line) => {
-      const trimmed = line.trim();
-      if (!trimmed) {
-        return;
-      }
-
-      // Skip debug output lines (e.g., [MESSAGE_BUS], [PolicyEngine], etc.)
-      if (trimmed.startsWith('[')) {
-        if (this.options.debug) {
-          console.log('[GeminiStreamClient] Skipping debug output:', trimmed.substring(0, 100));
-        }
-        return;
-      }
+    const splitter = new JsonlLineSplitter();
+    // Resolve the per-chunk/per-line callees once instead of on every call
+    const push = splitter.push.bind(splitter);
+    const handleLine = this.handleLine.bind(this);
 
-      try {
-        const event = JSON.parse(trimmed) as JsonStreamEvent;
-        this.handleEvent(event);
-      } catch (error) {
-        console.error('[GeminiStreamClient] Failed to parse JSON:', trimmed);
-        console.error('[GeminiStreamClient] Error:', error);
+    stdout.on('data', (chunk: Buffer) => {
+      for (const line of push(chunk)) {
+        handleLine(line);
       }
     });
 
-    this.readlineInterface.on('close', () => {
-      // stdout closed
+    stdout.on('end', () => {
+      // stdout closed - handle a final line without trailing newline
+      const rest = splitter.flush();
+      if (rest !== null) {
+        handleLine(rest);
+      }
       if (this.options.debug) {
-        console.log('[GeminiStreamClient] readline interface closed');
+        console.log('[GeminiStreamClient] stdout closed');
+      }
+      if (this.stdoutStream === stdout) {
+        this.stopReadLoop();
       }
     });
   }
 
+  /**
+   * Stop reading JSONL events from stdout
+   */
+  private stopReadLoop(): void {
+    if (this.stdoutStream) {
+      this.stdoutStream.removeAllListeners('data');
+      this.stdoutStream.removeAllListeners('end');
+      this.stdoutStream = null;
+    }
+  }
+
+  /**
+   * Parse a single stdout line and dispatch it as an event
+   */
+  private handleLine(line: string): void {
+    // Skip blank and debug output lines (e.g., [MESSAGE_BUS], [PolicyEngine], etc.)
+    const eventLine = normalizeEventLine(line);
+    if (eventLine === null) {
+      if (line && this.options.debug) {
+        console.log('[GeminiStreamClient] Skipping debug output:', line.substring(0, 100));
+      }
+      return;
+    }
+
+    try {
+      // A line may carry several coalesced events
+      for (const event of parseJsonLine(eventLine) as JsonStreamEvent[]) {
+        this.handleEvent(event);
+      }
+    } catch (error) {
+      console.error('[GeminiStreamClient] Failed to parse JSON:', line);
+      console.error('[GeminiStreamClient] Error:', error);
+    }
+  }
+
   /**
    * Handle a JSON stream event
    */
@@ -578,20 +818,46 @@ export class GeminiStreamClient extends EventEmitter {
         return;
       }
 
+      const cleanup = () => {
+        if (this.initTimeout) {
+          clearTimeout(this.initTimeout);
+          this.initTimeout = null;
+        }
+        this.off('ready', onReady);
+        this.off('error', onError);
+        this.off('stopped', onStopped);
+      };
+
+      const onReady = () => {
+        cleanup();
+        resolve();
+      };
+
+      const onError = (error: Error) => {
+        cleanup();
+        reject(error);
+      };
+
+      // Process exited before INIT: fail now instead of waiting out the timeout
+      const onStopped = (code: number | null) => {
+        cleanup();
+        reject(
+          new GeminiSDKError('Process exited before initialization', code ?? undefined, {
+            stderr: this.getStderr(),
+          }),
+        );
+      };
+
       // Set timeout
       this.initTimeout = setTimeout(() => {
+        cleanup();
         reject(new GeminiSDKError('Initialization timeout', undefined, { timeout }));
       }, timeout);
 
-      // Wait for ready event
-      this.once('ready', () => {
-        resolve();
-      });
-
-      // Or error
-      this.once('error', (error) => {
-        reject(error);
-      });
+      // Wait for ready event, error or early exit
+      this.once('ready', onReady);
+      this.once('error', onError);
+      this.once('stopped', onStopped);
     });
   }
 
@@ -605,20 +871,27 @@ export class GeminiStreamClient extends EventEmitter {
 
     if (code !== 0 && code !== null) {
       this.status = ProcessStatus.ERROR;
-      this.emit('error', new GeminiSDKError(`Process exited with code ${code}`, code));
+      const stderrOutput = this.getStderr();
+      this.emit(
+        'error',
+        new GeminiSDKError(
+          `Process exited with code ${code}${stderrOutput ? `\n${stderrOutput}` : ''}`,
+          code,
+          { stderr: stderrOutput },
+        ),
+      );
     } else {
       this.status = ProcessStatus.COMPLETED;
     }
 
     this.emit('stopped', code);
 
-    // Cleanup
+    // Cleanup (stdout stays attached until it ends so trailing events are not lost)
     this.process = null;
     this.stdinStream = null;
-    if (this.readlineInterface) {
-      this.readlineInterface.close();
-      this.readlineInterface = null;
-    }
+
+    // Terminate tools or MCP servers the CLI left running in its process group
+    this.processGroupReaped = this.reapProcessGroup();
   }
 
   /**
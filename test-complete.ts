@@ -10,15 +10,23 @@ import { fileURLToPath } from 'url';
 const __filename = fileURLToPath(import.meta.url);
 const __dirname = dirname(__filename);
 
+// Log every streamed event when TEST_VERBOSE=1; otherwise only milestone events
+// are logged per event and CONTENT is printed once per turn
+const VERBOSE = process.env.TEST_VERBOSE === '1';
+
+// Section separators, built once
+const HEAVY_RULE = '='.repeat(80);
+const LIGHT_RULE = '─'.repeat(80);
+
 async function testComplete() {
   const pathToGeminiCLI = join(
     __dirname,
     '../gemini.js'
   );
 
-  console.log('='.repeat(80));
+  console.log(HEAVY_RULE);
   console.log('🧪 Complete GeminiStreamClient Test');
-  console.log('='.repeat(80));
+  console.log(HEAVY_RULE);
   console.log('[Test] CLI Path:', pathToGeminiCLI);
   console.log('[Test] Model: gemini-3-pro-preview');
   console.log('[Test] Authentication: Vertex AI\n');
@@ -36,46 +44,81 @@ async function testComplete() {
     },
   });
 
-  // Track events
-  const events: any[] = [];
+  // Track events (counts only; event objects are not retained)
+  let totalEvents = 0;
+  const eventCounts: Record<string, number> = {};
   let initReceived = false;
   let contentReceived = false;
   let thoughtReceived = false;
   let resultReceived = false;
+  let turnContent = '';
 
-  // Listen to all events
-  client.on('event', (event) => {
-    events.push(event);
+  // Print and reset the CONTENT accumulated for the current turn
+  const flushTurnContent = () => {
+    if (turnContent) {
+      console.log('✅ CONTENT:', turnContent.substring(0, 100) + '...');
+      turnContent = '';
+    }
+  };
 
-    if (event.type === 'init') {
+  // Event handlers keyed by event type, built once instead of an if/else chain per event
+  const handlers: Record<string, (event: any) => void> = {
+    init: (event) => {
       console.log('✅ INIT:', {
         session_id: event.session_id,
         model: event.model,
       });
       initReceived = true;
-    } else if (event.type === 'content') {
-      console.log('✅ CONTENT:', event.value.substring(0, 100) + '...');
+    },
+    content: (event) => {
+      if (VERBOSE) {
+        console.log('✅ CONTENT:', event.value.substring(0, 100) + '...');
+      } else {
+        turnContent += event.value;
+      }
       contentReceived = true;
-    } else if (event.type === 'thought') {
-      console.log('💭 THOUGHT:', event.value.subject);
+    },
+    thought: (event) => {
+      if (VERBOSE) {
+        console.log('💭 THOUGHT:', event.value.subject);
+      }
       thoughtReceived = true;
-    } else if (event.type === 'tool_use') {
+    },
+    tool_use: (event) => {
       console.log('🔧 TOOL_USE:', event.tool_name);
-    } else if (event.type === 'tool_result') {
+    },
+    tool_result: (event) => {
       console.log('📊 TOOL_RESULT:', event.tool_id, '-', event.status);
-    } else if (event.type === 'result') {
+    },
+    result: (event) => {
+      flushTurnContent();
       console.log('🏁 RESULT:', event.status);
       resultReceived = true;
-    } else if (event.type === 'error') {
+    },
+    error: (event) => {
       console.error('❌ ERROR:', event.message || event.value?.message);
-    } else if (event.type === 'model_info') {
-      console.log('ℹ️  MODEL_INFO:', event.value);
-    } else if (event.type === 'finished') {
-      console.log('✔️  FINISHED:', {
-        reason: event.value.reason,
-        tokens: event.value.usageMetadata?.totalTokenCount,
-      });
-    }
+    },
+    // High-volume informational events are only formatted in verbose mode
+    ...(VERBOSE
+      ? {
+          model_info: (event: any) => {
+            console.log('ℹ️  MODEL_INFO:', event.value);
+          },
+          finished: (event: any) => {
+            console.log('✔️  FINISHED:', {
+              reason: event.value.reason,
+              tokens: event.value.usageMetadata?.totalTokenCount,
+            });
+          },
+        }
+      : {}),
+  };
+
+  // Listen to all events
+  client.on('event', (event) => {
+    totalEvents++;
+    eventCounts[event.type] = (eventCounts[event.type] || 0) + 1;
+    handlers[event.type]?.(event);
   });
 
   client.on('error', (error) => {
@@ -83,25 +126,25 @@ async function testComplete() {
   });
 
   try {
-    console.log('\n' + '─'.repeat(80));
+    console.log('\n' + LIGHT_RULE);
     console.log('Phase 1: Starting client and waiting for INIT...');
-    console.log('─'.repeat(80));
+    console.log(LIGHT_RULE);
     await client.start();
     console.log('✅ Client started successfully!\n');
 
     // Test 1: Simple greeting
-    console.log('─'.repeat(80));
+    console.log(LIGHT_RULE);
     console.log('Phase 2: Sending simple message...');
-    console.log('─'.repeat(80));
+    console.log(LIGHT_RULE);
     await client.sendMessage('Say "Hello World" in one sentence');
 
     await waitForResult();
     console.log('✅ First message completed!\n');
 
     // Test 2: Ask a question that might use tools
-    console.log('─'.repeat(80));
+    console.log(LIGHT_RULE);
     console.log('Phase 3: Sending question that may trigger tools...');
-    console.log('─'.repeat(80));
+    console.log(LIGHT_RULE);
     resultReceived = false;
     await client.sendMessage('What files are in the current directory? Just list the first 5.');
 
@@ -109,9 +152,9 @@ async function testComplete() {
     console.log('✅ Second message completed!\n');
 
     // Test 3: Ask about code
-    console.log('─'.repeat(80));
+    console.log(LIGHT_RULE);
     console.log('Phase 4: Asking about code...');
-    console.log('─'.repeat(80));
+    console.log(LIGHT_RULE);
     resultReceived = false;
     await client.sendMessage('Explain what GeminiStreamClient does in one sentence');
 
@@ -119,37 +162,33 @@ async function testComplete() {
     console.log('✅ Third message completed!\n');
 
     // Summary
-    console.log('='.repeat(80));
+    console.log(HEAVY_RULE);
     console.log('📊 Test Summary');
-    console.log('='.repeat(80));
-    console.log('Total events received:', events.length);
+    console.log(HEAVY_RULE);
+    console.log('Total events received:', totalEvents);
     console.log('INIT received:', initReceived ? '✅' : '❌');
     console.log('CONTENT received:', contentReceived ? '✅' : '❌');
     console.log('THOUGHT received:', thoughtReceived ? '✅' : '❌');
     console.log('RESULT received:', resultReceived ? '✅' : '❌');
 
     console.log('\nEvent type distribution:');
-    const eventCounts = events.reduce((acc, e) => {
-      acc[e.type] = (acc[e.type] || 0) + 1;
-      return acc;
-    }, {} as Record<string, number>);
     Object.entries(eventCounts).forEach(([type, count]) => {
       console.log(`  ${type}: ${count}`);
     });
 
-    console.log('\n' + '─'.repeat(80));
+    console.log('\n' + LIGHT_RULE);
     console.log('Stopping client...');
-    console.log('─'.repeat(80));
+    console.log(LIGHT_RULE);
     await client.stop();
 
-    console.log('\n' + '='.repeat(80));
+    console.log('\n' + HEAVY_RULE);
     if (initReceived && contentReceived && resultReceived) {
       console.log('🎉 All tests passed successfully!');
-      console.log('='.repeat(80));
+      console.log(HEAVY_RULE);
       process.exit(0);
     } else {
       console.log('⚠️  Some tests failed');
-      console.log('='.repeat(80));
+      console.log(HEAVY_RULE);
       process.exit(1);
     }
   } catch (error) {
@@ -163,20 +202,29 @@ async function testComplete() {
   }
 
   async function waitForResult() {
+    if (resultReceived) {
+      return;
+    }
+
+    // Resolve on the RESULT event itself rather than polling for it
     return new Promise<void>((resolve) => {
-      const checkInterval = setInterval(() => {
-        if (resultReceived) {
-          clearInterval(checkInterval);
+      const onEvent = (event: { type: string }) => {
+        if (event.type === 'result') {
+          clearTimeout(timeoutId);
+          client.off('event', onEvent);
           resolve();
         }
-      }, 100);
+      };
 
       // Timeout after 30 seconds
-      setTimeout(() => {
-        clearInterval(checkInterval);
+      const timeoutId = setTimeout(() => {
+        client.off('event', onEvent);
+        flushTurnContent();
         console.log('⚠️  Timeout waiting for result');
         resolve();
       }, 30000);
+
+      client.on('event', onEvent);
     });
   }
 }
@@ -0,0 +1,33 @@
+/**
+ * Minimal stand-in for the Gemini CLI in --stream-json-input mode
+ *
+ * Behaviour is selected with FAKE_CLI_MODE:
+ * - exit-before-init: write to stderr and exit 1 without an INIT event
+ * - ignore-sigterm: emit INIT, then ignore SIGTERM and stdin EOF
+ * - (default): emit INIT, and on stdin EOF emit a RESULT event right before exiting
+ */
+
+const mode = process.env.FAKE_CLI_MODE;
+
+function emit(event) {
+  process.stdout.write(JSON.stringify(event) + '\n');
+}
+
+if (mode === 'exit-before-init') {
+  process.stderr.write('fatal: bad configuration\n', () => process.exit(1));
+} else {
+  emit({ type: 'init', timestamp: new Date().toISOString(), session_id: 'fake-session', model: 'fake-model' });
+
+  if (mode === 'ignore-sigterm') {
+    process.on('SIGTERM', () => {});
+    setInterval(() => {}, 1000);
+  } else {
+    process.stdin.resume();
+    process.stdin.on('end', () => {
+      process.stdout.write(
+        JSON.stringify({ type: 'result', timestamp: new Date().toISOString(), status: 'success' }) + '\n',
+        () => process.exit(0),
+      );
+    });
+  }
+}
@@ -0,0 +1,86 @@
+/**
+ * Tests for JSONL helpers
+ */
+
+import { describe, it, expect } from 'vitest';
+import { JsonlLineSplitter, normalizeEventLine, parseJsonLine } from '../src/jsonl';
+
+describe('JsonlLineSplitter', () => {
+  it('should split a chunk into complete lines', () => {
+    const splitter = new JsonlLineSplitter();
+    expect(splitter.push(Buffer.from('{"a":1}\n{"b":2}\n'))).toEqual(['{"a":1}', '{"b":2}']);
+    expect(splitter.flush()).toBeNull();
+  });
+
+  it('should join lines split across chunks', () => {
+    const splitter = new JsonlLineSplitter();
+    expect(splitter.push(Buffer.from('{"type":'))).toEqual([]);
+    expect(splitter.push(Buffer.from('"init"'))).toEqual([]);
+    expect(splitter.push(Buffer.from('}\n{"type"'))).toEqual(['{"type":"init"}']);
+    expect(splitter.push(Buffer.from(':"result"}\n'))).toEqual(['{"type":"result"}']);
+  });
+
+  it('should not corrupt multi-byte characters split across chunks', () => {
+    const splitter = new JsonlLineSplitter();
+    const bytes = Buffer.from('{"content":"你好"}\n');
+    expect(splitter.push(bytes.subarray(0, 13))).toEqual([]);
+    expect(splitter.push(bytes.subarray(13))).toEqual(['{"content":"你好"}']);
+  });
+
+  it('should strip carriage returns', () => {
+    const splitter = new JsonlLineSplitter();
+    expect(splitter.push(Buffer.from('{"a":1}\r'))).toEqual([]);
+    expect(splitter.push(Buffer.from('\n{"b":2}\r\n'))).toEqual(['{"a":1}', '{"b":2}']);
+  });
+
+  it('should return the unterminated trailing line on flush', () => {
+    const splitter = new JsonlLineSplitter();
+    expect(splitter.push(Buffer.from('{"a":1}\n{"b":2}'))).toEqual(['{"a":1}']);
+    expect(splitter.flush()).toBe('{"b":2}');
+    expect(splitter.flush()).toBeNull();
+  });
+});
+
+describe('normalizeEventLine', () => {
+  it('should return event lines unchanged', () => {
+    expect(normalizeEventLine('{"type":"init"}')).toBe('{"type":"init"}');
+  });
+
+  it('should trim padded event lines', () => {
+    expect(normalizeEventLine('  {"type":"init"} ')).toBe('{"type":"init"}');
+    expect(normalizeEventLine('\uFEFF{"type":"init"}')).toBe('{"type":"init"}');
+  });
+
+  it('should skip blank and debug lines', () => {
+    expect(normalizeEventLine('')).toBeNull();
+    expect(normalizeEventLine('   ')).toBeNull();
+    expect(normalizeEventLine('[MESSAGE_BUS] ready')).toBeNull();
+  });
+});
+
+describe('parseJsonLine', () => {
+  it('should parse a single object', () => {
+    expect(parseJsonLine('{"type":"init","session_id":"abc"}')).toEqual([
+      { type: 'init', session_id: 'abc' },
+    ]);
+  });
+
+  it('should parse objects coalesced onto one line', () => {
+    expect(parseJsonLine('{"type":"message"} {"type":"result","stats":{"total":1}}')).toEqual([
+      { type: 'message' },
+      { type: 'result', stats: { total: 1 } },
+    ]);
+  });
+
+  it('should not split on braces inside strings', () => {
+    expect(parseJsonLine('{"content":"}{\\"x\\"{"}{"type":"result"}')).toEqual([
+      { content: '}{"x"{' },
+      { type: 'result' },
+    ]);
+  });
+
+  it('should throw for invalid JSON', () => {
+    expect(() => parseJsonLine('{"type":')).toThrow(SyntaxError);
+    expect(() => parseJsonLine('{"a":1} trailing')).toThrow(SyntaxError);
+  });
+});
@@ -0,0 +1,63 @@
+/**
+ * Tests for GeminiStreamClient process lifecycle, driven by a fake CLI script
+ */
+
+import { describe, it, expect } from 'vitest';
+import { join, dirname } from 'path';
+import { fileURLToPath } from 'url';
+import { GeminiStreamClient } from '../src/streamClient';
+import { GeminiSDKError, ProcessStatus } from '../src/types';
+
+const FAKE_CLI = join(dirname(fileURLToPath(import.meta.url)), 'fixtures', 'fake-gemini-cli.mjs');
+
+function createClient(mode?: string): GeminiStreamClient {
+  return new GeminiStreamClient({
+    pathToGeminiCLI: FAKE_CLI,
+    pathToNode: process.execPath,
+    sessionId: 'test-session',
+    initTimeout: 10000,
+    env: mode ? { FAKE_CLI_MODE: mode } : {},
+  });
+}
+
+describe('GeminiStreamClient.start', () => {
+  it('should reject quickly with stderr when the CLI exits before INIT', async () => {
+    const client = createClient('exit-before-init');
+    client.on('error', () => {});
+
+    const startedAt = Date.now();
+    const error = await client.start().catch((e: unknown) => e);
+
+    expect(error).toBeInstanceOf(GeminiSDKError);
+    expect((error as GeminiSDKError).details).toEqual({
+      stderr: expect.stringContaining('fatal: bad configuration'),
+    });
+    expect(Date.now() - startedAt).toBeLessThan(5000);
+
+    await client.stop();
+  });
+});
+
+describe('GeminiStreamClient.stop', () => {
+  it('should deliver events the CLI writes right before exiting', async () => {
+    const client = createClient();
+    const types: string[] = [];
+    client.on('event', (event) => types.push(event.type));
+
+    await client.start();
+    await client.stop();
+
+    expect(types).toEqual(['init', 'result']);
+    expect(client.getStatus()).toBe(ProcessStatus.COMPLETED);
+  });
+
+  it('should SIGKILL a CLI that ignores SIGTERM', async () => {
+    const client = createClient('ignore-sigterm');
+    await client.start();
+    const pid = client.getPid()!;
+
+    await client.stop(200);
+
+    expect(() => process.kill(pid, 0)).toThrow();
+  });
+});